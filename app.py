@@ -78,47 +78,97 @@ data_labels = {
     "carbon_content": "Carbon content (t CO2/MWh)",
 }
 
+# Define factors from the stored units to the displayed ones, percentages are stored as fractions
+display_factors = {
+    "discount_rate": 100,
+    "capital_cost_contingency": 100,
+    "capacity_factor": 100,
+    "decommissioning_cost_factor": 100,
+}
 
-# Function to generate the Plotly pie chart
-def create_pie_chart(data):
+# Default values in the stored units, as used by the calculation
+stored_defaults = {
+    category: (
+        value / display_factors[category] if category in display_factors else value
+    )
+    for category, value in default_values.items()
+}
+
+# Precompute (min_value, step, label, display_factor) of each widget,
+# as the script reruns on every input
+widget_specs = {
+    category: (
+        0 if isinstance(value, int) else 0.0,
+        step_values[category],
+        data_labels[category],
+        display_factors.get(category),
+    )
+    for category, value in default_values.items()
+}
+
+
+def to_display(category, value):
+    """Convert a stored value to the units of its widget"""
+    min_value, _, _, display_factor = widget_specs[category]
+    if display_factor is None:
+        return value
+    display_value = value * display_factor
+    # integer widgets need integer values, rounding also removes the conversion error
+    return round(display_value, None if isinstance(min_value, int) else 10)
+
+
+def from_display(category, value):
+    """Convert a widget value to the stored units"""
+    display_factor = widget_specs[category][3]
+    return value if display_factor is None else value / display_factor
+
+
+# Function to calculate the LCOE and cost breakdown, cached as it only depends on the inputs
+@st.cache_data(max_entries=32, show_spinner=False)
+def calculate_cost_breakdown(**data):
     """Key functionality"""
 
+    # inputs, bound once
+    discount_rate = data["discount_rate"]  # -
+    power = data["power"]  # MWe
+    overnight_cost = data["overnight_cost"]  # $/kWe
+    capital_cost_contingency = data["capital_cost_contingency"]  # -
+    capacity_factor = data["capacity_factor"]  # -
+    o_and_m_cost = data["o_and_m_cost"]  # $/MWh
+    fuel_cost = data["fuel_cost"]  # $/MWh
+    decommissioning_cost_factor = data["decommissioning_cost_factor"]  # -
+    construction_duration = data["construction_duration"]  # years
+    operational_lifetime = data["operational_lifetime"]  # years
+    decommissioning_duration = data["decommissioning_duration"]  # years
+    carbon_cost = data["carbon_cost"]  # $/t CO2
+    carbon_content = data["carbon_content"]  # t/MWh
+
     # capital cost
-    power_kw = data["power"] * 1000  # kWe
-    overnight_cost_total = data["overnight_cost"] * power_kw  # $
-    capital_cost_cgy_abs = data["capital_cost_contingency"] / 100  # -
-    overnight_cost_w_contingency = overnight_cost_total * (1 + capital_cost_cgy_abs)
-    capital_cost_per_year = overnight_cost_w_contingency / data["construction_duration"]
+    power_kw = power * 1000  # kWe
+    overnight_cost_total = overnight_cost * power_kw  # $
+    overnight_cost_w_contingency = overnight_cost_total * (1 + capital_cost_contingency)
+    capital_cost_per_year = overnight_cost_w_contingency / construction_duration
 
     # fuel and O&M
-    capacity_factor_abs = data["capacity_factor"] / 100
-    mwh_per_year = HOURS_IN_YEAR * data["power"] * capacity_factor_abs
-    o_and_m_cost_per_year = data["o_and_m_cost"] * mwh_per_year
-    fuel_cost_per_year = data["fuel_cost"] * mwh_per_year
+    mwh_per_year = HOURS_IN_YEAR * power * capacity_factor
+    o_and_m_cost_per_year = o_and_m_cost * mwh_per_year
+    fuel_cost_per_year = fuel_cost * mwh_per_year
 
     # decommissioning
-    decommissioning_cost_factor_abs = data["decommissioning_cost_factor"] / 100  # -
-    decommissioning_cost = decommissioning_cost_factor_abs * overnight_cost_total
-    decommissioning_cost_per_year = (
-        decommissioning_cost / data["decommissioning_duration"]
-    )
+    decommissioning_cost = decommissioning_cost_factor * overnight_cost_total
+    decommissioning_cost_per_year = decommissioning_cost / decommissioning_duration
 
     # carbon
-    carbon_cost_per_mwh = data["carbon_cost"] * data["carbon_content"]  # $/MWh
+    carbon_cost_per_mwh = carbon_cost * carbon_content  # $/MWh
     carbon_cost_per_year = carbon_cost_per_mwh * mwh_per_year
 
-    # discount rate
-    discount_rate_abs = data["discount_rate"] / 100
-
     # timeline
     construction_start = PRESENT_YEAR
-    construction_end = construction_start + int(data["construction_duration"]) - 1
+    construction_end = construction_start + int(construction_duration) - 1
     operation_start = construction_end + 1
-    operation_end = operation_start + int(data["operational_lifetime"]) - 1
+    operation_end = operation_start + int(operational_lifetime) - 1
     decommissioning_start = operation_end + 1
-    decommissioning_end = (
-        decommissioning_start + int(data["decommissioning_duration"]) - 1
-    )
+    decommissioning_end = decommissioning_start + int(decommissioning_duration) - 1
 
     # cash flows
     cost_items_rolled = {
@@ -139,12 +189,9 @@ def create_pie_chart(data):
     # Revenue in form of MWh per year
     revenue_data = evl.create_cash_flow((operation_start, operation_end, mwh_per_year))
 
-    # LCOE
-    lcoe = evl.calculate_lcoe(cost_items, revenue_data, discount_rate_abs, PRESENT_YEAR)
-
-    # Cost data
-    discounted_costs = evl.discount_cash_flows(
-        cost_items, discount_rate_abs, PRESENT_YEAR
+    # LCOE and cost data, in a single pass over the cost items
+    lcoe, discounted_costs = evl.lcoe_and_breakdown(
+        cost_items, revenue_data, discount_rate, PRESENT_YEAR
     )
 
     # Normalize values to 100% for each dictionary
@@ -156,11 +203,23 @@ def create_pie_chart(data):
     # Normalize to percentages
     values = [v / total * 100 for v in discounted_costs.values()]
 
-    # Plotting
-    title = f"LCOE {lcoe:.0f} $/MWh"
+    return lcoe, labels, values
+
+
+# Function to generate the Plotly pie chart
+def create_pie_chart(**data):
+    """Update the pie chart of the session with the cost breakdown for the inputs"""
+    lcoe, labels, values = calculate_cost_breakdown(**data)
+
+    # The figure is built once per session, reruns only update the values and the title
+    fig = st.session_state.get("pie_chart")
+    if fig is None:
+        fig = go.Figure(data=[go.Pie(labels=labels)])
+        fig.update_layout(title_x=0.5, font={"size": 16})
+        st.session_state.pie_chart = fig
 
-    fig = go.Figure(data=[go.Pie(labels=labels, values=values)])
-    fig.update_layout(title_text=title, title_x=0.5, font={"size": 16})
+    fig.data[0].values = values
+    fig.layout.title.text = f"LCOE {lcoe:.0f} $/MWh"
 
     return fig
 
@@ -184,12 +243,12 @@ def main():
 
     st.sidebar.header("Input Parameters")
 
-    # Initialize or retrieve session state for user data
+    # Initialize or retrieve session state for user data, kept in the stored units
     if "user_data_less" not in st.session_state:
-        st.session_state.user_data_less = default_values.copy()
+        st.session_state.user_data_less = stored_defaults.copy()
 
     if "user_data_more" not in st.session_state:
-        st.session_state.user_data_more = default_values.copy()
+        st.session_state.user_data_more = stored_defaults.copy()
 
     # Ensure refresh_key exists in session state
     if "refresh_key" not in st.session_state:
@@ -201,8 +260,8 @@ def main():
     reset_clicked = reset_col.button("Reset")
 
     if reset_clicked:
-        st.session_state.user_data_less = default_values.copy()
-        st.session_state.user_data_more = default_values.copy()
+        st.session_state.user_data_less = stored_defaults.copy()
+        st.session_state.user_data_more = stored_defaults.copy()
         # Change widget keys to force refresh of number_input
         st.session_state.refresh_key = str(int(st.session_state.refresh_key) + 1)
         st.rerun()
@@ -211,41 +270,49 @@ def main():
     if not show_more:
         # Collect inputs from the user for basic inputs
         for category in basic_inputs:
-            value_type = type(default_values[category])
-            st.session_state.user_data_less[category] = st.sidebar.number_input(
-                f"{data_labels[category]}:",
-                value=st.session_state.user_data_more.get(
-                    category, default_values[category]
+            min_value, step, label, _ = widget_specs[category]
+            value = st.sidebar.number_input(
+                f"{label}:",
+                value=to_display(
+                    category,
+                    st.session_state.user_data_more.get(
+                        category, stored_defaults[category]
+                    ),
                 ),
-                min_value=0 if value_type == int else 0.0,
-                step=step_values[category],
+                min_value=min_value,
+                step=step,
                 key=f"{category}_{st.session_state.refresh_key}",
             )
+            st.session_state.user_data_less[category] = from_display(category, value)
 
         # Preserve values for extra inputs without displaying them
         for category in extra_inputs:
             st.session_state.user_data_less[category] = (
-                st.session_state.user_data_more.get(category, default_values[category])
+                st.session_state.user_data_more.get(category, stored_defaults[category])
             )
 
         # Create the chart
-        pie_chart = create_pie_chart(st.session_state.user_data_less)
+        pie_chart = create_pie_chart(**st.session_state.user_data_less)
     else:
         # Collect inputs from the user for all inputs
         for category in basic_inputs + extra_inputs:
-            value_type = type(default_values[category])
-            st.session_state.user_data_more[category] = st.sidebar.number_input(
-                f"{data_labels[category]}:",
-                value=st.session_state.user_data_less.get(
-                    category, default_values[category]
+            min_value, step, label, _ = widget_specs[category]
+            value = st.sidebar.number_input(
+                f"{label}:",
+                value=to_display(
+                    category,
+                    st.session_state.user_data_less.get(
+                        category, stored_defaults[category]
+                    ),
                 ),
-                min_value=0 if value_type == int else 0.0,
-                step=step_values[category],
+                min_value=min_value,
+                step=step,
                 key=f"{category}_{st.session_state.refresh_key}",
             )
+            st.session_state.user_data_more[category] = from_display(category, value)
 
         # Create the chart
-        pie_chart = create_pie_chart(st.session_state.user_data_more)
+        pie_chart = create_pie_chart(**st.session_state.user_data_more)
 
     # Display the chart
     st.plotly_chart(pie_chart)
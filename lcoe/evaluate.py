@@ -1,53 +1,132 @@
 """Core functionality"""
 
+from dataclasses import dataclass
+from typing import NamedTuple
 
-class CashFlowData:
-    """Holds all needed data"""
+import numpy as np
 
-    def __init__(self, years, values, discount_rate=None):
-        self.years = years
-        self.values = values
-        self.discount_rate = discount_rate
 
-    def net_present_value(self, present_year, external_discount_rate=None):
-        """Calculate NPV given data"""
-        discount_rate = (
-            external_discount_rate
-            if external_discount_rate is not None
-            else self.discount_rate
+class ConstantCashFlow(NamedTuple):
+    """Holds a cash flow with the same value in every year of a period"""
+
+    start_year: int
+    end_year: int
+    value: float
+    discount_rate: float | None = None
+
+
+def _discount_factors(discount_rates, start_years, end_years, present_year):
+    """
+    Calculate the combined discount factor of constant cash flows.
+
+    Works element-wise on scalars and arrays alike.
+
+    Args:
+        discount_rates (float or np.ndarray): Discount rates of the cash flows.
+        start_years (int or np.ndarray): First years of the cash flows.
+        end_years (int or np.ndarray): Last years of the cash flows.
+        present_year (int): The year against which the cash flows should be discounted.
+
+    Returns:
+        np.ndarray: Net present value of a unit value paid in every year of each period.
+    """
+    # an end year before the start year is an empty cash flow
+    periods = np.maximum(end_years - start_years + 1, 0)
+    # work with log(1 + r), as 1 + r itself rounds away rates close to zero
+    log_growth = np.log1p(discount_rates)
+    # the first year is discounted by (1 + r)^-(start - present)
+    first_discount_factors = np.exp((present_year - start_years) * log_growth)
+    # sum of (1 + r)^-k for k = 0 .. periods - 1, which is just periods at r = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_factors = np.where(
+            (discount_rates == 0) | (periods == 0),
+            periods,
+            np.expm1(-periods * log_growth) / np.expm1(-log_growth),
+        )
+    return first_discount_factors * annuity_factors
+
+
+def constant_cash_flow_npv(cash_flow, present_year, discount_rate):
+    """
+    Calculate NPV of a constant cash flow as a sum of a geometric series.
+
+    Args:
+        cash_flow (ConstantCashFlow): The cash flow to discount.
+        present_year (int): The year against which the cash flow should be discounted.
+        discount_rate (float): Discount rate to be used.
+
+    Returns:
+        float: Net present value of the cash flow.
+    """
+    start_year, end_year, value, _ = cash_flow
+    return float(
+        value * _discount_factors(discount_rate, start_year, end_year, present_year)
+    )
+
+
+@dataclass
+class CostBook:
+    """Holds constant cost items as parallel arrays, one entry per item"""
+
+    names: list
+    starts: np.ndarray
+    ends: np.ndarray
+    values: np.ndarray
+    rates: np.ndarray  # NaN where the default discount rate applies
+
+    @classmethod
+    def from_cash_flows(cls, cash_flows):
+        """Create a CostBook from a dictionary of ConstantCashFlow objects"""
+        items = cash_flows.values()
+        count = len(cash_flows)
+        # fill the arrays straight from the items, without intermediate lists
+        return cls(
+            names=list(cash_flows),
+            starts=np.fromiter(
+                (cf.start_year for cf in items), dtype=np.int64, count=count
+            ),
+            ends=np.fromiter(
+                (cf.end_year for cf in items), dtype=np.int64, count=count
+            ),
+            values=np.fromiter(
+                (cf.value for cf in items), dtype=np.float64, count=count
+            ),
+            rates=np.fromiter(
+                (cf.discount_rate or np.nan for cf in items),
+                dtype=np.float64,
+                count=count,
+            ),
+        )
+
+    def npv_per_item(self, default_discount_rate, present_year):
+        """Calculate NPV of all items at once as sums of geometric series"""
+        discount_rates = np.where(
+            np.isnan(self.rates), default_discount_rate, self.rates
+        )
+        return self.values * _discount_factors(
+            discount_rates, self.starts, self.ends, present_year
         )
-        if discount_rate is None:
-            raise ValueError(
-                "Discount rate needs to be specified, "
-                "either as a member object or as an argument to this method."
-            )
-        npv = 0.0
-        for year, value in zip(self.years, self.values):
-            periods_into_future = year - present_year
-            npv += value / (1 + discount_rate) ** periods_into_future
-        return npv
 
 
 def create_cash_flow(expense_tuple, discount_rate=None):
     """
-    Create a CashFlow object.
+    Create a ConstantCashFlow object.
 
     Args:
         expense_tuple (tuple): Tuple containing (start_year, end_year, expense_value).
         discount_rate (float, optional): Discount rate for the cas flow.
 
     Returns:
-        CashFlow object.
+        ConstantCashFlow object.
     """
     start_year, end_year, expense_value = expense_tuple
-    years = list(range(start_year, end_year + 1))
 
-    return CashFlowData(years, [expense_value for y in years], discount_rate)
+    return ConstantCashFlow(start_year, end_year, expense_value, discount_rate)
 
 
 def create_cost_item(cost_item_name, expense_tuple, discount_rate=None):
     """
-    Create a cost item dictionary entry.
+    Create a cost item as a (name, cash flow) pair.
 
     Args:
         cost_item_name (str): Name of the cost item.
@@ -55,51 +134,54 @@ def create_cost_item(cost_item_name, expense_tuple, discount_rate=None):
         discount_rate (float, optional): Discount rate for the cost item.
 
     Returns:
-        dict: Cost item dictionary entry with appropriate structure.
+        tuple: Name of the cost item and its ConstantCashFlow object.
     """
 
-    cost_item = {cost_item_name: create_cash_flow(expense_tuple, discount_rate)}
+    return cost_item_name, create_cash_flow(expense_tuple, discount_rate)
+
 
-    return cost_item
+# Split expense data into the expense tuple and the discount rate, by its length
+_EXPENSE_DATA_UNROLLERS = {
+    # (start_year, end_year, expense_value)
+    3: lambda expense_data: (expense_data, None),
+    # (start_year, end_year, expense_value, discount_rate)
+    4: lambda expense_data: (expense_data[:-1], expense_data[-1]),
+}
 
 
 def unroll_cost_item(cost_item_name, expense_data):
     """
     Body of the function below.
     """
-    if isinstance(expense_data, tuple) and len(expense_data) == 3:
-        # If expense_data is a tuple, assume it contains (start_year, end_year, expense_value)
-        cost_item = create_cost_item(cost_item_name, expense_data)
-    elif isinstance(expense_data, tuple) and len(expense_data) == 4:
-        # If it  4 elements, assume it contains (start_year, end_year, expense_value, discount_rate)
-        cost_item = create_cost_item(
-            cost_item_name, expense_data[:-1], expense_data[-1]
-        )
-    else:
+    unroller = (
+        _EXPENSE_DATA_UNROLLERS.get(len(expense_data))
+        if isinstance(expense_data, tuple)
+        else None
+    )
+    if unroller is None:
         raise ValueError("Invalid format for expense data.")
+    expense_tuple, discount_rate = unroller(expense_data)
 
-    return cost_item
+    return create_cost_item(cost_item_name, expense_tuple, discount_rate)
 
 
 def create_cost_items(cost_items_rolled):
     """
-    Create cost_items dictionary from cost_items_rolled.
+    Create cost_items from cost_items_rolled.
 
     Args:
         cost_items_rolled (dict): Dictionary with cost_item_name as keys and expense_tuple
                                   as values, possibly including discount_rate.
 
     Returns:
-        dict: Dictionary with cost_item_name as keys
-              and corresponding expense tuples in the format used in cost_items.
+        CostBook: All cost items, in the order of cost_items_rolled.
     """
-    cost_items = {}  # Initialize the cost_items dictionary
-
-    for cost_item_name, expense_data in cost_items_rolled.items():
-        cost_item = unroll_cost_item(cost_item_name, expense_data)
-        cost_items.update(cost_item)
+    cost_items = dict(
+        unroll_cost_item(cost_item_name, expense_data)
+        for cost_item_name, expense_data in cost_items_rolled.items()
+    )
 
-    return cost_items
+    return CostBook.from_cash_flows(cost_items)
 
 
 def discount_cash_flows(cost_items, default_discount_rate, present_year):
@@ -107,8 +189,7 @@ def discount_cash_flows(cost_items, default_discount_rate, present_year):
     Calculate the discounted cash flows for all cost items.
 
     Args:
-        cost_items (dict): Dictionary of cost items where keys are cost item names,
-                           and values are CashFlowData objects.
+        cost_items (CostBook): Cost items as returned by create_cost_items.
         default_discount_rate (float): Default discount rate to be used
                                        if not specified for a cost item.
         present_year (int): The year against which all cash flows should be discounted.
@@ -116,43 +197,56 @@ def discount_cash_flows(cost_items, default_discount_rate, present_year):
     Returns:
         dict: Dictionary containing net present value for each cost item.
     """
-    discounted_cash_flows = {}
-    for cash_flow_name, cash_flow_data in cost_items.items():
-        item_discount_rate = cash_flow_data.discount_rate or default_discount_rate
-        discounted_cash_flows[cash_flow_name] = cash_flow_data.net_present_value(
-            present_year, item_discount_rate
-        )
+    npvs = cost_items.npv_per_item(default_discount_rate, present_year)
 
-    return discounted_cash_flows
+    return dict(zip(cost_items.names, npvs.tolist()))
 
 
-def calculate_lcoe(cost_items, revenue_data, default_discount_rate, present_year):
+def lcoe_and_breakdown(cost_items, revenue_data, default_discount_rate, present_year):
     """
-    Calculate the Levelized Cost of Energy (LCOE) for an energy infrastructure project.
+    Calculate the LCOE together with the discounted cash flows of all cost items.
 
     Args:
-        cost_items (dict): Dictionary of cost items where keys are cost item names,
-                           and values are CashFlowData objects.
-        revenue_data (CashFlowData): CashFlowData object for revenue data.
+        cost_items (CostBook): Cost items as returned by create_cost_items.
+        revenue_data (ConstantCashFlow): Revenue data as returned by create_cash_flow.
         default_discount_rate (float): Default discount rate to be used
                                        if not specified for a cost item.
         present_year (int): The year against which all cash flows should be discounted.
 
     Returns:
-        float: LCOE in $/MWh.
+        tuple: LCOE in $/MWh and dictionary containing net present value
+               for each cost item.
     """
     revenue_discount_rate = revenue_data.discount_rate or default_discount_rate
-    total_discounted_revenue = revenue_data.net_present_value(
-        present_year, revenue_discount_rate
+    total_discounted_revenue = constant_cash_flow_npv(
+        revenue_data, present_year, revenue_discount_rate
     )
 
-    discounted_expenses = discount_cash_flows(
-        cost_items, default_discount_rate, present_year
-    )
-    total_discounted_expenses = 0.0
-    for _, discounted_expense in discounted_expenses.items():
-        total_discounted_expenses += discounted_expense
+    # the cost item NPVs are evaluated once and used for both outputs
+    npvs = cost_items.npv_per_item(default_discount_rate, present_year)
+    total_discounted_expenses = float(npvs.sum())
 
     lcoe = total_discounted_expenses / total_discounted_revenue
 
+    return lcoe, dict(zip(cost_items.names, npvs.tolist()))
+
+
+def calculate_lcoe(cost_items, revenue_data, default_discount_rate, present_year):
+    """
+    Calculate the Levelized Cost of Energy (LCOE) for an energy infrastructure project.
+
+    Args:
+        cost_items (CostBook): Cost items as returned by create_cost_items.
+        revenue_data (ConstantCashFlow): Revenue data as returned by create_cash_flow.
+        default_discount_rate (float): Default discount rate to be used
+                                       if not specified for a cost item.
+        present_year (int): The year against which all cash flows should be discounted.
+
+    Returns:
+        float: LCOE in $/MWh.
+    """
+    lcoe, _ = lcoe_and_breakdown(
+        cost_items, revenue_data, default_discount_rate, present_year
+    )
+
     return lcoe